@@ -4,50 +4,63 @@ Author: Ethan Jones
 Written: 07/11/2020
 """
 
+import os
+import io
+import gzip
+import pickle
+import tempfile
+import threading
 import unittest
-from datetime import datetime, date, time
-import pytz
+from unittest import mock
+from datetime import datetime, date, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+import requests
 
+import pandas as pd
 import pandas.api.types as ptypes
+import pvlive_api
 from pvlive_api import PVLive
 
+EXPECTED_DTYPES = {
+    "pes_id": ptypes.is_integer_dtype,
+    "gsp_id": ptypes.is_integer_dtype,
+    "datetime_gmt": ptypes.is_datetime64_any_dtype,
+    "generation_mw": ptypes.is_float_dtype,
+    "bias_error": ptypes.is_float_dtype,
+    "capacity_mwp": ptypes.is_float_dtype,
+    "installedcapacity_mwp": ptypes.is_float_dtype,
+    "lcl_mw": ptypes.is_float_dtype,
+    "stats_error": ptypes.is_float_dtype,
+    "ucl_mw": ptypes.is_float_dtype,
+    "uncertainty_MW": ptypes.is_float_dtype,
+    "site_count": ptypes.is_integer_dtype,
+    "release": ptypes.is_string_dtype,
+    "GSPs": ptypes.is_string_dtype,
+    "llsoa": ptypes.is_string_dtype,
+    "system_size": ptypes.is_string_dtype,
+    "install_month": ptypes.is_datetime64_dtype,
+    "dc_capacity_mwp": ptypes.is_float_dtype,
+    "system_count": ptypes.is_integer_dtype,
+    "cumul_capacity_mwp": ptypes.is_float_dtype,
+}
+
 class PVLiveTestCase(unittest.TestCase):
     """Tests for `pvlive.py`."""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Setup the instance of class.
+        Setup a single instance of the class, shared by all tests.
         """
-        self.api = PVLive(
+        cls.api = PVLive(
             retries=3,
             proxies=None,
             ssl_verify=True,
             # domain_url="api0.solar.sheffield.ac.uk",
             domain_url="api.solar.sheffield.ac.uk",
             # domain_url="api.pvlive.uk"
+            use_cache=False,
         )
-        self.expected_dtypes = {
-            "pes_id": ptypes.is_integer_dtype,
-            "gsp_id": ptypes.is_integer_dtype,
-            "datetime_gmt": ptypes.is_datetime64_any_dtype,
-            "generation_mw": ptypes.is_float_dtype,
-            "bias_error": ptypes.is_float_dtype,
-            "capacity_mwp": ptypes.is_float_dtype,
-            "installedcapacity_mwp": ptypes.is_float_dtype,
-            "lcl_mw": ptypes.is_float_dtype,
-            "stats_error": ptypes.is_float_dtype,
-            "ucl_mw": ptypes.is_float_dtype,
-            "uncertainty_MW": ptypes.is_float_dtype,
-            "site_count": ptypes.is_integer_dtype,
-            "release": ptypes.is_string_dtype,
-            "GSPs": ptypes.is_string_dtype,
-            "llsoa": ptypes.is_string_dtype,
-            "system_size": ptypes.is_string_dtype,
-            "install_month": ptypes.is_datetime64_dtype,
-            "dc_capacity_mwp": ptypes.is_float_dtype,
-            "system_count": ptypes.is_integer_dtype,
-            "cumul_capacity_mwp": ptypes.is_float_dtype,
-        }
 
     def check_df_dtypes(self, api_df):
         """
@@ -55,9 +68,9 @@ class PVLiveTestCase(unittest.TestCase):
         against the expected dtypes from the API.
         """
         for column in api_df.columns:
-            if column in self.expected_dtypes:
+            if column in EXPECTED_DTYPES:
                 with self.subTest(column=column):
-                    assert self.expected_dtypes[column](api_df[column])
+                    assert EXPECTED_DTYPES[column](api_df[column])
 
     def check_gsp_tuple_dtypes(self, data):
         """
@@ -159,6 +172,27 @@ class PVLiveTestCase(unittest.TestCase):
         self.check_df_columns(data)
         self.check_df_dtypes(data)
 
+    def test_latest_bulk(self):
+        """Tests the latest_bulk function."""
+        data = self.api.latest_bulk(entity_type="pes", entity_ids=[0, 23])
+        self.check_df_columns(data)
+        self.check_df_dtypes(data)
+        with self.subTest():
+            assert set(data.pes_id) == {0, 23}
+        data = self.api.latest_bulk(entity_type="gsp", entity_ids=[0, 103], period=5)
+        self.check_df_columns(data)
+        self.check_df_dtypes(data)
+        data = self.api.latest_bulk(entity_type="pes", entity_ids=self.api.pes_ids)
+        with self.subTest():
+            assert set(data.pes_id) == set(self.api.pes_ids)
+        with self.subTest(test_type="errors"):
+            with self.assertRaises(ValueError):
+                self.api.latest_bulk(entity_ids=[])
+            with self.assertRaises(TypeError):
+                self.api.latest_bulk(entity_ids=23)
+            with self.assertRaises(TypeError):
+                self.api.latest_bulk(entity_ids="23")
+
     def test_day_peak(self):
         """Tests the day_peak function."""
         test_date = date(2024, 12, 17)
@@ -208,6 +242,47 @@ class PVLiveTestCase(unittest.TestCase):
         self.check_df_columns(data)
         self.check_df_dtypes(data)
 
+    def test_day_peak_nulls(self):
+        """Tests that day_peak ignores null generation values."""
+        meta = ["pes_id", "datetime_gmt", "generation_mw"]
+        data = [[0, "2024-12-17T08:00:00Z", None], [0, "2024-12-17T12:00:00Z", 5.0],
+                [0, "2024-12-17T12:30:00Z", 2.0]]
+        with mock.patch.object(self.api, "_between", return_value=(data, meta)):
+            self.assertEqual(self.api.day_peak(date(2024, 12, 17), entity_type="pes"),
+                             (0, "2024-12-17T12:00:00Z", 5.0))
+        data = [[0, "2024-12-17T08:00:00Z", None], [0, "2024-12-17T08:30:00Z", None]]
+        with mock.patch.object(self.api, "_between", return_value=(data, meta)):
+            self.assertIsNone(self.api.day_peak(date(2024, 12, 17), entity_type="pes"))
+
+    def test_downcast(self):
+        """Tests that DataFrames use compact dtypes only when `downcast=True`."""
+        start = datetime(2024, 12, 17, 12, 0, tzinfo=timezone.utc)
+        response = {"data": [[0, "2024-12-17T12:00:00Z", 5.0], [0, "2024-12-17T12:30:00Z", 2.0]],
+                    "meta": ["pes_id", "datetime_gmt", "generation_mw"]}
+        csv = gzip.compress(b"GSPs,dc_capacity_MWp,system_count\nA,1.5,10\nB,2.5,3\n")
+        expected = {
+            False: {"pes_id": "int64", "generation_mw": "float64", "dc_capacity_mwp": "float64"},
+            True: {"pes_id": "uint16", "generation_mw": "float32", "dc_capacity_mwp": "float32"},
+        }
+        for downcast in (False, True):
+            with PVLive(use_cache=False, downcast=downcast) as api, \
+                    mock.patch.object(api, "_query_api", return_value=response), \
+                    mock.patch.object(api, "_get_deployment_releases", return_value=["20240101"]), \
+                    mock.patch.object(api, "_get_deployment_filenames",
+                                      return_value=["20240101_capacity_by_20220314_GSP.csv.gz"]), \
+                    mock.patch.object(api, "_fetch_stream") as fetch_stream:
+                fetch_stream.return_value.__enter__.return_value.raw = io.BytesIO(csv)
+                data = api.between(start, start + timedelta(minutes=30), entity_type="pes",
+                                   dataframe=True)
+                deployment = api.deployment(region="gsp")
+            with self.subTest(downcast=downcast):
+                self.assertEqual(str(data.pes_id.dtype), expected[downcast]["pes_id"])
+                self.assertEqual(str(data.generation_mw.dtype), expected[downcast]["generation_mw"])
+                self.assertEqual(str(deployment.dc_capacity_mwp.dtype),
+                                 expected[downcast]["dc_capacity_mwp"])
+                self.assertEqual(isinstance(deployment.release.dtype, pd.CategoricalDtype),
+                                 downcast)
+
     def test_day_energy(self):
         """Tests the day_energy function."""
         data = self.api.day_energy(d=date(2023, 12, 1), entity_type="pes", entity_id=0)
@@ -217,7 +292,7 @@ class PVLiveTestCase(unittest.TestCase):
         """Test the between function."""
         test_date = date(2024, 12, 17)
         get_test_time = lambda h, m: datetime.combine(test_date, time(h, m))\
-                                             .replace(tzinfo=pytz.UTC)
+                                             .replace(tzinfo=timezone.utc)
         data = self.api.between(
             start=get_test_time(12, 20),
             end=get_test_time(14, 0),
@@ -255,9 +330,42 @@ class PVLiveTestCase(unittest.TestCase):
         self.check_df_columns(data)
         self.check_df_dtypes(data)
 
+    def test_between_errors(self):
+        """Test that invalid between inputs are rejected before any request is made."""
+        start = datetime(2024, 12, 17, 12, 0, tzinfo=timezone.utc)
+        end = datetime(2024, 12, 17, 14, 0, tzinfo=timezone.utc)
+        with PVLive(use_cache=False) as api, mock.patch.object(api, "_get") as get:
+            for bad_start, bad_end in ((None, end), (start, None), (start.replace(tzinfo=None), end),
+                                       (end, start)):
+                with self.subTest(start=bad_start, end=bad_end):
+                    with self.assertRaises(ValueError):
+                        api.between(bad_start, bad_end, entity_type="gsp", entity_id=26)
+            get.assert_not_called()
+
+    def test_between_windows(self):
+        """Test that between requests are split into windows no longer than `max_range`."""
+        start = datetime(2023, 1, 1, 0, 30, tzinfo=timezone.utc)
+        end = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        response = {"data": [], "meta": ["gsp_id", "datetime_gmt", "generation_mw"]}
+        with mock.patch.object(self.api, "_query_api", return_value=response) as query_api:
+            self.api.between(start=start, end=end, entity_type="gsp", entity_id=0)
+            self.assertEqual(query_api.call_count, 1)
+            query_api.reset_mock()
+            self.api.between(start=start, end=end, entity_type="pes", entity_id=0)
+            self.assertEqual(query_api.call_count, 1)
+            query_api.reset_mock()
+            with mock.patch.object(self.api, "_map", wraps=self.api._map) as map_:
+                self.api.between_bulk(start=start, end=end, entity_type="pes", entity_ids=[0, 23])
+            self.assertEqual(query_api.call_count, 14)
+            map_.assert_called_once()  # i.e. all windows share one thread pool
+        windows = PVLive._windows(start, end, self.api.max_range["regional"])
+        self.assertEqual(len(windows), 13)
+        self.assertEqual(windows[0][0], start)
+        self.assertEqual(windows[-1][1], end)
+
     def test_at_time(self):
         """Test the at_time function."""
-        test_time = datetime(2024, 12, 18, 12, 35, tzinfo=pytz.utc)
+        test_time = datetime(2024, 12, 18, 12, 35, tzinfo=timezone.utc)
         data = self.api.at_time(dt=test_time, entity_type="pes", entity_id=0)
         self.check_pes_tuple(data)
         self.check_pes_tuple_dtypes(data)
@@ -294,6 +402,88 @@ class PVLiveTestCase(unittest.TestCase):
         self.check_df_columns(data)
         self.check_df_dtypes(data)
 
+    def test_nearest_interval(self):
+        """Test rounding of datetimes up to the next 30 or 5 minute interval."""
+        on_interval = datetime(2024, 12, 18, 12, 30, tzinfo=timezone.utc)
+        self.assertEqual(PVLive._nearest_interval(on_interval), on_interval)
+        self.assertEqual(PVLive._nearest_interval(on_interval, period=5), on_interval)
+        test_time = datetime(2024, 12, 18, 12, 30, 0, 1, tzinfo=timezone.utc)
+        self.assertEqual(PVLive._nearest_interval(test_time),
+                         datetime(2024, 12, 18, 13, 0, tzinfo=timezone.utc))
+        self.assertEqual(PVLive._nearest_interval(test_time, period=5),
+                         datetime(2024, 12, 18, 12, 35, tzinfo=timezone.utc))
+        test_time = datetime(2024, 12, 18, 23, 35, 12, 500, tzinfo=timezone.utc)
+        self.assertEqual(PVLive._nearest_interval(test_time),
+                         datetime(2024, 12, 19, 0, 0, tzinfo=timezone.utc))
+
+    def test_format_datetime(self):
+        """Test that request timestamps are converted to UTC."""
+        test_time = datetime(2024, 6, 1, 13, 30, tzinfo=ZoneInfo("Europe/London"))
+        self.assertEqual(PVLive._format_datetime(test_time), "2024-06-01T12:30:00Z")
+        test_time = datetime(2024, 12, 1, 13, 30, tzinfo=timezone.utc)
+        self.assertEqual(PVLive._format_datetime(test_time), "2024-12-01T13:30:00Z")
+
+    def test_at_time_bulk(self):
+        """Test the at_time_bulk function."""
+        test_time = datetime(2024, 12, 18, 12, 35, tzinfo=timezone.utc)
+        data = self.api.at_time_bulk(test_time, entity_type="gsp", entity_ids=[0, 26, 54])
+        self.check_df_columns(data)
+        self.check_df_dtypes(data)
+        with self.subTest():
+            assert list(data.gsp_id) == [0, 26, 54]
+        data = self.api.at_time_bulk(test_time, entity_type="gsp", entity_ids=(0, 26, 54))
+        with self.subTest():
+            assert list(data.gsp_id) == [0, 26, 54]
+        with self.subTest(test_type="errors"):
+            with self.assertRaises(ValueError):
+                self.api.at_time_bulk(test_time, entity_ids=[])
+
+    def test_between_bulk(self):
+        """Test the between_bulk function."""
+        start = datetime(2024, 12, 17, 10, 0, tzinfo=timezone.utc)
+        end = datetime(2024, 12, 17, 12, 0, tzinfo=timezone.utc)
+        data = self.api.between_bulk(start, end, entity_type="pes", entity_ids=[0, 23])
+        self.check_df_columns(data)
+        self.check_df_dtypes(data)
+        with self.subTest():
+            assert list(data.pes_id.unique()) == [0, 23]
+            assert len(data) == 10
+        with self.subTest(test_type="errors"):
+            with self.assertRaises(ValueError):
+                self.api.between_bulk(start, end, entity_ids=[])
+        response = {"data": [], "meta": ["pes_id", "datetime_gmt", "generation_mw"]}
+        with mock.patch.object(self.api, "_query_api", return_value=response):
+            with self.subTest(test_type="no data"):
+                assert self.api.between_bulk(start, end, entity_type="pes",
+                                             entity_ids=[0, 23]) is None
+
+    def test_map(self):
+        """Test the map function."""
+        test_date = date(2024, 12, 17)
+        data = self.api.map("day_peak", [
+            dict(d=test_date, entity_type="pes", entity_id=0),
+            dict(d=test_date, entity_type="gsp", entity_id=54),
+        ])
+        with self.subTest():
+            assert isinstance(data, list) and len(data) == 2
+        self.check_pes_tuple(data[0])
+        self.check_pes_tuple_dtypes(data[0])
+        self.check_gsp_tuple(data[1])
+        self.check_gsp_tuple_dtypes(data[1])
+        with self.subTest(test_type="errors"):
+            with self.assertRaises(ValueError):
+                self.api.map("_fetch_json", [dict(url="")])
+        start = datetime(2023, 1, 1, 0, 30, tzinfo=timezone.utc)
+        end = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        response = {"data": [], "meta": ["pes_id", "datetime_gmt", "generation_mw"]}
+        with mock.patch.object(self.api, "_query_api", return_value=response) as query_api, \
+                mock.patch("pvlive_api.pvlive.ThreadPoolExecutor",
+                           wraps=pvlive_api.pvlive.ThreadPoolExecutor) as executor:
+            self.api.map("between", [dict(start=start, end=end, entity_type="pes", entity_id=i)
+                                     for i in (0, 23)])
+        self.assertEqual(query_api.call_count, 14)
+        executor.assert_called_once()  # i.e. the windows of each between() share map()'s pool
+
     def test_deployment(self):
         """Tests the deployment function."""
         # import pdb; pdb.set_trace()
@@ -316,5 +506,92 @@ class PVLiveTestCase(unittest.TestCase):
         self.check_deployment_df_columns(data)
         self.check_df_dtypes(data)
 
+    def test_retries(self):
+        """Tests that retries are configured on the Session's adapter."""
+        adapter = self.api._session.get_adapter(self.api.base_url)
+        self.assertEqual(adapter.max_retries.total, self.api.retries)
+        with self.subTest():
+            assert 503 in adapter.max_retries.status_forcelist
+            assert 404 not in adapter.max_retries.status_forcelist
+        with self.subTest():
+            assert adapter.max_retries.backoff_max == 30 and adapter.max_retries.backoff_jitter > 0
+
+    def test_session(self):
+        """Tests that a caller-provided Session is used and not closed."""
+        session = mock.create_autospec(requests.Session, instance=True)
+        with PVLive(use_cache=False, session=session) as api:
+            with self.subTest():
+                assert api._session is session
+        session.close.assert_not_called()
+
+    def test_pickle(self):
+        """Tests that a PVLive instance can be pickled, e.g. to pass it to multiprocessing."""
+        with PVLive(use_cache=False, cache_size=16) as api:
+            api._gsp_id_set  # Unpickling should keep the loaded lists
+            copy = pickle.loads(pickle.dumps(api))
+        with copy:
+            with self.subTest():
+                assert copy._session is not api._session and "_gsp_id_set" in vars(copy)
+                assert copy._get_cached.cache_parameters()["maxsize"] == 16
+            copy._validate_inputs(entity_type="gsp", entity_id=26)
+
+    def test_default(self):
+        """Tests the shared default instance and the module-level functions which use it."""
+        with mock.patch.object(PVLive, "_default", None):
+            api = PVLive.default()
+            with self.subTest():
+                assert PVLive.default() is api
+            with mock.patch.object(api, "latest") as latest:
+                pvlive_api.latest(entity_type="pes", entity_id=0)
+            latest.assert_called_once_with(entity_type="pes", entity_id=0)
+
+    def test_memory_cache(self):
+        """Tests that cached responses are kept in memory as bytes, up to `cache_size`."""
+        url = f"{self.api.base_url}/pes/0?period=30"
+        for cache_size, expected_calls in ((1024, 1), (0, 2)):
+            with PVLive(use_cache=False, cache_size=cache_size) as api, \
+                    mock.patch.object(api, "_get") as get:
+                get.return_value.content = b'{"data": [], "meta": []}'
+                for _ in range(2):
+                    self.assertEqual(api._fetch_json(url, cache=True), {"data": [], "meta": []})
+                with self.subTest(cache_size=cache_size):
+                    assert get.call_count == expected_calls
+                    assert api._get_cached.cache_info().currsize == min(cache_size, 1)
+
+    def test_lazy_lists(self):
+        """Tests that the GSP and PES lists are only fetched when first needed."""
+        with PVLive(use_cache=False) as api:
+            with self.subTest():
+                assert "gsp_list" not in vars(api) and "pes_list" not in vars(api)
+            with self.subTest():
+                assert 0 in api.gsp_ids and 23 in api.pes_ids
+
+    def test_lazy_lists_threads(self):
+        """Tests that the GSP list is fetched once when first needed by several threads."""
+        def get_gsp_list():
+            threading.Event().wait(0.05)  # Give the other threads time to race
+            return gsp_list
+        gsp_list = self.api.gsp_list
+        with PVLive(use_cache=False) as api, \
+                mock.patch.object(api, "_get_gsp_list", side_effect=get_gsp_list) as get:
+            api._map(lambda entity_id: api._validate_inputs("gsp", entity_id), [26] * 8)
+        get.assert_called_once()
+
+    def test_disk_cache(self):
+        """Tests that the GSP list is cached on disk and read back."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            default_cache_dir = self.api.cache_dir
+            self.api.use_cache, self.api.cache_dir = True, cache_dir
+            try:
+                gsp_list = self.api._get_gsp_list()
+                with self.subTest():
+                    assert len(os.listdir(cache_dir)) == 1
+                self.assertTrue(self.api._get_gsp_list().equals(gsp_list))
+                self.api.refresh()
+                with self.subTest():
+                    assert not os.listdir(cache_dir) and "gsp_list" not in vars(self.api)
+            finally:
+                self.api.use_cache, self.api.cache_dir = False, default_cache_dir
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
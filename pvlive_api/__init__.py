@@ -1,3 +1,4 @@
-from pvlive_api.pvlive import PVLive
+from pvlive_api.pvlive import (PVLive, latest, at_time, between, day_peak, day_energy,
+                                deployment)
 
-__all__ = ["PVLive"]
+__all__ = ["PVLive", "latest", "at_time", "between", "day_peak", "day_energy", "deployment"]
@@ -8,27 +8,74 @@ A Python interface for the PV_Live web API from Sheffield Solar.
 
 import sys
 import os
-import json
-from datetime import datetime, timedelta, date, time
-from time import sleep
+from datetime import datetime, timedelta, date, time, timezone
+from functools import lru_cache, cached_property
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Union, Tuple, Dict, Optional, Literal
-import inspect
 import argparse
 import re
-from io import BytesIO
+import threading
+from hashlib import sha1
+from urllib.parse import urlencode
+from importlib.metadata import version, PackageNotFoundError
 
-import pytz
 import requests
-from numpy import nan, int64
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+try:
+    from isal.igzip import open as gzip_open
+except ImportError:
+    gzip_open = None
+
+# Sent with every request so that the API can identify this client and its version
+try:
+    USER_AGENT = f"pvlive-api/{version('pvlive_api')}"
+except PackageNotFoundError:
+    USER_AGENT = "pvlive-api"
+
+# Used to extract the error message from the API's Bad Request (400) responses
+BAD_REQUEST_REGEX = re.compile(r"<p>(.*)</p>")
+# Used to scrape the Apache directory listings under `/capacity`
+HREF_REGEX = re.compile(rb"""<a\s[^>]*href=["']([^"']+)["']""", re.IGNORECASE)
+RELEASE_REGEX = re.compile(rb"[0-9]{8}/")
+FILENAME_REGEX = re.compile(rb".+\.csv\.gz")
+# Marks threads running inside `PVLive._map()`, so that nested calls do not start another pool
+_POOL_WORKER = threading.local()
+
+# Compact dtypes used when `PVLive(downcast=True)`
+DOWNCAST_DTYPES = {
+    "pes_id": "uint16",
+    "gsp_id": "uint16",
+    "generation_mw": "float32",
+    "bias_error": "float32",
+    "capacity_mwp": "float32",
+    "installedcapacity_mwp": "float32",
+    "lcl_mw": "float32",
+    "stats_error": "float32",
+    "ucl_mw": "float32",
+    "uncertainty_MW": "float32",
+    "site_count": "UInt32",
+    "release": "category",
+    "GSPs": "category",
+    "llsoa": "category",
+    "system_size": "category",
+    "dc_capacity_mwp": "float32",
+    "system_count": "UInt32",
+    "cumul_capacity_mwp": "float32",
+}
 
 class PVLiveException(Exception):
     """An Exception specific to the PVLive class."""
     def __init__(self, msg):
         try:
-            caller_file = inspect.stack()[2][1]
-        except:
+            caller_file = os.path.basename(sys._getframe(2).f_code.co_filename)
+        except ValueError:
             caller_file = os.path.basename(__file__)
         self.msg = f"{msg} (in '{caller_file}')"
 
@@ -42,12 +89,33 @@ class PVLive:
     Parameters
     ----------
     retries : int
-        Optionally specify the number of retries to use should the API respond with anything
-        other than status code 200. Exponential back-off applies inbetween retries.
+        Optionally specify the number of retries to use should the connection fail or the API
+        respond with a server error (5xx) or 429. Exponential back-off applies inbetween retries.
     proxies : Optional[Dict]
         Optionally specify a Dict of proxies for http and https requests in the format:
         {"http": "<address>", "https": "<address>"}
+    downcast : bool
+        Set to True to return DataFrames using compact dtypes (e.g. float32 instead of float64,
+        categoricals instead of strings), which roughly halves their memory footprint at the
+        expense of precision. Defaults to False.
+    use_cache : bool
+        Set to False to disable the on-disk cache of the GSP list, PES list and deployment
+        releases, which is otherwise shared between PVLive instances and refreshed after 24 hours.
+        The cache is stored in `$XDG_CACHE_HOME/pvlive_api` (default `~/.cache/pvlive_api`).
+        Defaults to True.
+    cache_size : int
+        The maximum number of historical API responses (those for intervals ending more than two
+        days ago, which no longer change) to keep in memory so that repeat queries are not
+        re-fetched. Each holds the raw response body, which can be several hundred KB for long
+        5-minutely queries. Set to 0 to disable. Defaults to 1024.
+    session : Optional[requests.Session]
+        Optionally pass a pre-configured requests Session to use for all API calls (e.g. with
+        custom headers, adapters or authentication for a proxy). It is used as-is, so the `retries`
+        parameter does not apply, and it will not be closed by `close()`.
     """
+    _default = None
+    _default_lock = threading.Lock()
+
     def __init__(
         self,
         retries: int = 3,
@@ -57,7 +125,11 @@ class PVLive:
             "api0.solar.sheffield.ac.uk",
             "api.solar.sheffield.ac.uk",
             "api.pvlive.uk"
-        ] = "api.solar.sheffield.ac.uk"
+        ] = "api.solar.sheffield.ac.uk",
+        downcast: bool = False,
+        use_cache: bool = True,
+        cache_size: int = 1024,
+        session: Optional[requests.Session] = None
     ):
         valid_domain_urls = [
             "api0.solar.sheffield.ac.uk",
@@ -71,46 +143,155 @@ class PVLive:
         self.domain_url = f"https://{domain_url}"
         self.base_url = f"{self.domain_url}/pvlive/api/v4"
         self.max_range = {"national": timedelta(days=365), "regional": timedelta(days=30)}
+        # Outturns are re-computed on day+1, so only results older than this are cached
+        self.cache_horizon = timedelta(days=2)
         self.retries = retries
         self.proxies = proxies
         self.ssl_verify = ssl_verify
         self.timeout = 30
-        self.gsp_list = self._get_gsp_list()
-        self.pes_list = self._get_pes_list()
-        self.gsp_ids = self.gsp_list.gsp_id.dropna().astype(int64).unique()
-        self.pes_ids = self.pes_list.pes_id.dropna().astype(int64).unique()
+        self.max_workers = 8
+        self.downcast = downcast
+        self.use_cache = use_cache
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"),
+                                                                      ".cache")
+        self.cache_dir = os.path.join(cache_home, "pvlive_api")
+        self.cache_ttl = timedelta(days=1)
+        self._owns_session = session is None
+        self._session = self._create_session() if session is None else session
+        self.cache_size = cache_size
+        self._get_cached = lru_cache(maxsize=cache_size)(self._get_content)
+        self.deployment_releases = None
+        # Guards the first fetch of the GSP/PES lists when inputs are validated in worker threads
+        self._lists_lock = threading.Lock()
+
+    def _create_session(self):
+        """
+        Create a requests Session so that connections to the API are pooled and kept alive.
+
+        Failed connections and server errors are retried by urllib3 with jittered exponential
+        back-off (capped at 30 seconds), so that many clients do not retry in lock-step.
+        """
+        session = requests.Session()
+        session.headers["User-Agent"] = f"{USER_AGENT} {session.headers['User-Agent']}"
+        retry = Retry(total=self.retries, backoff_factor=1, backoff_max=30, backoff_jitter=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @classmethod
+    def default(cls):
+        """
+        Get a shared PVLive instance (created with the default parameters on first use), so that
+        independent callers reuse the same connection pool and caches.
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def close(self):
+        """
+        Close the underlying requests Session and release any pooled connections, unless the
+        Session was passed in by the caller.
+        """
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # The response cache, lock and our own Session can't be pickled, so are rebuilt on load
+        state = self.__dict__.copy()
+        for name in ("_get_cached", "_lists_lock") + (("_session",) if self._owns_session else ()):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._owns_session:
+            self._session = self._create_session()
+        self._get_cached = lru_cache(maxsize=self.cache_size)(self._get_content)
+        self._lists_lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Discard the cached GSP list, PES list, deployment releases and historical API responses
+        (both in memory and on disk) so that they are re-fetched from the API when next needed.
+        """
+        with self._lists_lock:
+            for name in ("gsp_list", "pes_list", "gsp_ids", "pes_ids", "_gsp_id_set",
+                         "_pes_id_set"):
+                self.__dict__.pop(name, None)
         self.deployment_releases = None
+        self._get_cached.cache_clear()
+        for url in (f"{self.base_url}/gsp_list", f"{self.base_url}/pes_list",
+                    f"{self.domain_url}/capacity/"):
+            try:
+                os.remove(self._cache_file(url))
+            except OSError:
+                pass
+
+    @cached_property
+    def gsp_list(self):
+        """The list of GSPs as a Pandas DataFrame, fetched from the API on first access."""
+        return self._get_gsp_list()
+
+    @cached_property
+    def pes_list(self):
+        """The list of PES regions as a Pandas DataFrame, fetched from the API on first access."""
+        return self._get_pes_list()
+
+    @cached_property
+    def gsp_ids(self):
+        """The unique GSP IDs as a numpy array."""
+        return self.gsp_list.gsp_id.dropna().astype(np.int64).unique()
+
+    @cached_property
+    def pes_ids(self):
+        """The unique PES IDs as a numpy array."""
+        return self.pes_list.pes_id.dropna().astype(np.int64).unique()
+
+    @cached_property
+    def _gsp_id_set(self):
+        return frozenset(self.gsp_ids.tolist())
+
+    @cached_property
+    def _pes_id_set(self):
+        return frozenset(self.pes_ids.tolist())
 
     def _get_gsp_list(self):
         """Fetch the GSP list from the API and convert to Pandas DataFrame."""
         url = f"{self.base_url}/gsp_list"
-        response = self._fetch_url(url)
+        response = self._parse_json(self._fetch_persistent(url))
         return pd.DataFrame(response["data"], columns=response["meta"])
 
     def _get_pes_list(self):
         """Fetch the PES list from the API and convert to Pandas DataFrame."""
         url = f"{self.base_url}/pes_list"
-        response = self._fetch_url(url)
+        response = self._parse_json(self._fetch_persistent(url))
         return pd.DataFrame(response["data"], columns=response["meta"])
 
     def _get_deployment_releases(self):
         """Get a list of deployment releases as datestamps (YYYYMMDD)."""
         if self.deployment_releases is None:
             url = f"{self.domain_url}/capacity/"
-            response = self._fetch_url(url, parse_json=False)
-            soup = BeautifulSoup(response.content, "html.parser")
-            releases = [r["href"].strip("/") for r in soup.find_all("a", href=True)
-                        if re.match(r"[0-9]{8}/", r["href"])]
+            hrefs = HREF_REGEX.findall(self._fetch_persistent(url))
+            releases = [h.strip(b"/").decode() for h in hrefs if RELEASE_REGEX.match(h)]
             self.deployment_releases = sorted(releases, reverse=True)
         return self.deployment_releases
 
     def _get_deployment_filenames(self, release):
         """Get a list of filenames for a given release."""
         url = f"{self.domain_url}/capacity/{release}/"
-        response = self._fetch_url(url, parse_json=False)
-        soup = BeautifulSoup(response.content, "html.parser")
-        filenames = [r["href"] for r in soup.find_all("a", href=True)
-                     if re.match(r".+\.csv.gz", r["href"])]
+        hrefs = HREF_REGEX.findall(self._fetch_content(url, cache=True))
+        filenames = [h.decode() for h in hrefs if FILENAME_REGEX.match(h)]
         return filenames
 
     def _validate_deployment_inputs(self, region, include_history, by_system_size, release):
@@ -174,14 +355,20 @@ class PVLive:
         filename_ending = f"_capacity_by_{region_}{history_}{system_size_}.csv.gz"
         filename = [f for f in filenames if f.endswith(filename_ending)][0]
         url = f"{self.domain_url}/capacity/{release}/{filename}"
-        kwargs = dict(parse_dates=["install_month"]) if include_history else {}
-        response = self._fetch_url(url, parse_json=False)
-        mock_file = BytesIO(response.content)
-        deployment_data = pd.read_csv(mock_file, compression={"method": "gzip"}, **kwargs)
+        kwargs = dict(dtype={"dc_capacity_MWp": "float64", "system_count": "Int64"}, engine="c")
+        if include_history:
+            kwargs["parse_dates"] = ["install_month"]
+        with self._fetch_stream(url) as response:
+            response.raw.decode_content = True  # Undo any HTTP content-encoding, but not the .gz
+            if gzip_open is None:
+                deployment_data = pd.read_csv(response.raw, compression={"method": "gzip"},
+                                              **kwargs)
+            else:
+                with gzip_open(response.raw, "rb") as fid:
+                    deployment_data = pd.read_csv(fid, **kwargs)
         deployment_data.insert(0, "release", release)
         deployment_data.rename(columns={"dc_capacity_MWp": "dc_capacity_mwp"}, inplace=True)
-        deployment_data.system_count = deployment_data.system_count.astype("Int64")
-        return deployment_data
+        return self._downcast(deployment_data)
 
     def latest(self,
                entity_type: Literal["gsp", "pes"] = "gsp",
@@ -225,8 +412,7 @@ class PVLive:
         """
         self._validate_inputs(entity_type=entity_type, entity_id=entity_id,
                               extra_fields=extra_fields, period=period)
-        params = self._compile_params(extra_fields, period=period)
-        response = self._query_api(entity_type, entity_id, params)
+        response = self._query_api(entity_type, entity_id, extra_fields, period=period)
         if response["data"]:
             data, meta = response["data"], response["meta"]
             data = tuple(data[0])
@@ -329,6 +515,173 @@ class PVLive:
         """
         return self._between(start, end, entity_type, entity_id, extra_fields, period, dataframe)[0]
 
+    def latest_bulk(self,
+                    entity_ids: List[int],
+                    entity_type: Literal["gsp", "pes"] = "gsp",
+                    extra_fields: str = "",
+                    period: int = 30) -> pd.DataFrame:
+        """
+        Get the latest PV_Live generation result for several entities from the API.
+
+        Parameters
+        ----------
+        entity_ids : list
+            The numerical IDs of the entities of interest, e.g. a list or the `gsp_ids` array.
+        entity_type : string
+            The aggregation entity type of interest, either "pes" or "gsp". Defaults to "gsp".
+        extra_fields : string
+            Comma-separated string listing any extra fields.
+        period : int
+            Time-resolution to retrieve, either 30 or 5 (minutely). Default is 30.
+
+        Returns
+        -------
+        Pandas DataFrame
+            Contains the columns pes_id, datetime_gmt and generation_mw, plus any extra_fields in
+            the order specified, with one row per entity.
+        OR
+        None
+            If no data found, return None.
+
+        Notes
+        -----
+        The requests for each entity are made concurrently. For list of optional *extra_fields*,
+        see `PV_Live API Docs <https://www.solar.sheffield.ac.uk/pvlive/api/>`_.
+        """
+        entity_ids = self._validate_entity_ids(entity_ids)
+        results = self._map(
+            lambda entity_id: self.latest(entity_type=entity_type, entity_id=entity_id,
+                                          extra_fields=extra_fields, period=period,
+                                          dataframe=True),
+            entity_ids
+        )
+        return self._concat(results)
+
+    def at_time_bulk(self,
+                     dt: datetime,
+                     entity_ids: List[int],
+                     entity_type: Literal["gsp", "pes"] = "gsp",
+                     extra_fields: str = "",
+                     period: int = 30) -> pd.DataFrame:
+        """
+        Get the PV_Live generation result for a given time for several entities from the API.
+
+        Parameters
+        ----------
+        dt : datetime
+            A timezone-aware datetime object. Will be corrected to the END of the half hour in which
+            *dt* falls, since Sheffield Solar use end of interval as convention.
+        entity_ids : list
+            The numerical IDs of the entities of interest, e.g. a list or the `gsp_ids` array.
+        entity_type : string
+            The aggregation entity type of interest, either "pes" or "gsp". Defaults to "gsp".
+        extra_fields : string
+            Comma-separated string listing any extra fields.
+        period : int
+            Time-resolution to retrieve, either 30 or 5 (minutely). Default is 30.
+
+        Returns
+        -------
+        Pandas DataFrame
+            Contains the columns pes_id, datetime_gmt and generation_mw, plus any extra_fields in
+            the order specified, with one row per entity.
+        OR
+        None
+            If no data found, return None.
+
+        Notes
+        -----
+        The requests for each entity are made concurrently. For list of optional *extra_fields*,
+        see `PV_Live API Docs <https://www.solar.sheffield.ac.uk/pvlive/api/>`_.
+        """
+        entity_ids = self._validate_entity_ids(entity_ids)
+        results = self._map(
+            lambda entity_id: self.at_time(dt, entity_type=entity_type, entity_id=entity_id,
+                                           extra_fields=extra_fields, period=period,
+                                           dataframe=True),
+            entity_ids
+        )
+        return self._concat(results)
+
+    def between_bulk(self,
+                     start: datetime,
+                     end: datetime,
+                     entity_ids: List[int],
+                     entity_type: Literal["gsp", "pes"] = "gsp",
+                     extra_fields: str = "",
+                     period: int = 30) -> pd.DataFrame:
+        """
+        Get the PV_Live generation result for a given time interval for several entities from the
+        API.
+
+        Parameters
+        ----------
+        start : datetime
+            A timezone-aware datetime object. Will be corrected to the END of the half hour in which
+            *start* falls, since Sheffield Solar use end of interval as convention.
+        end : datetime
+            A timezone-aware datetime object. Will be corrected to the END of the half hour in which
+            *end* falls, since Sheffield Solar use end of interval as convention.
+        entity_ids : list
+            The numerical IDs of the entities of interest, e.g. a list or the `gsp_ids` array.
+        entity_type : string
+            The aggregation entity type of interest, either "pes" or "gsp". Defaults to "gsp".
+        extra_fields : string
+            Comma-separated string listing any extra fields.
+        period : int
+            Time-resolution to retrieve, either 30 or 5 (minutely). Default is 30.
+
+        Returns
+        -------
+        Pandas DataFrame
+            Contains the columns pes_id, datetime_gmt and generation_mw, plus any extra_fields in
+            the order specified, with the rows for each entity in the order of *entity_ids*.
+        OR
+        None
+            If no data found, return None.
+
+        Notes
+        -----
+        The requests for each entity (and each window of a long interval) share a single pool of
+        `max_workers` threads. For list of optional *extra_fields*, see `PV_Live API Docs
+        <https://www.solar.sheffield.ac.uk/pvlive/api/>`_.
+        """
+        entity_ids = self._validate_entity_ids(entity_ids)
+        tasks = [(entity_id, window) for entity_id in entity_ids for window in
+                 self._entity_windows(start, end, entity_type, entity_id, extra_fields, period)]
+        data, meta = self._query_windows(entity_type, extra_fields, period, tasks)
+        if data:
+            return self._convert_tuple_to_df(data, meta)
+        return None
+
+    def map(self,
+            method: Literal["latest", "at_time", "between", "day_peak", "day_energy", "deployment"],
+            kwargs_list: List[Dict],
+            max_workers: Optional[int] = None) -> List:
+        """
+        Call one of the query methods several times concurrently, sharing one connection pool.
+
+        Parameters
+        ----------
+        method : str
+            The name of the method to call, e.g. "between".
+        kwargs_list : list
+            A list of dicts, each giving the keyword arguments for one call to `method`.
+        max_workers : int
+            Optionally specify the maximum number of calls to run at once. Defaults to
+            `self.max_workers`.
+
+        Returns
+        -------
+        list
+            The result of each call, in the same order as `kwargs_list`.
+        """
+        methods = ["latest", "at_time", "between", "day_peak", "day_energy", "deployment"]
+        if method not in methods:
+            raise ValueError(f"The method must be one of: {', '.join(methods)}.")
+        func = getattr(self, method)
+        return self._map(lambda kwargs: func(**kwargs), kwargs_list, max_workers=max_workers)
+
     def day_peak(self,
                  d: date,
                  entity_type: Literal["gsp", "pes"] = "gsp",
@@ -365,7 +718,7 @@ class PVLive:
             the order specified.
         OR
         None
-            If no data found for the day, return None.
+            If no data (or no non-null generation) found for the day, return None.
 
         Notes
         -----
@@ -374,14 +727,16 @@ class PVLive:
         """
         if not isinstance(d, date):
             raise TypeError("`d` must be a Python date object.")
-        start = datetime.combine(d, time(0, 30, tzinfo=pytz.UTC))
+        start = datetime.combine(d, time(0, 30, tzinfo=timezone.utc))
         end = start + timedelta(days=1) - timedelta(minutes=30)
         data, meta = self._between(start, end, entity_type, entity_id, extra_fields, period=period)
         if data:
             gen_index = meta.index("generation_mw")
-            gens = [x[gen_index] if x[gen_index] is not None else -1e308 for x in data]
-            index_max = max(range(len(gens)), key=gens.__getitem__)
-            maxdata = tuple(data[index_max])
+            gens = np.fromiter((np.nan if x[gen_index] is None else x[gen_index] for x in data),
+                               dtype=np.float64, count=len(data))
+            if np.isnan(gens).all():
+                return None
+            maxdata = tuple(data[int(np.nanargmax(gens))])
             if dataframe:
                 return self._convert_tuple_to_df(maxdata, meta)
             return maxdata
@@ -410,13 +765,14 @@ class PVLive:
         """
         if not isinstance(d, date):
             raise TypeError("`d` must be a Python date object.")
-        start = datetime.combine(d, time(0, 30, tzinfo=pytz.UTC))
+        start = datetime.combine(d, time(0, 30, tzinfo=timezone.utc))
         end = start + timedelta(days=1) - timedelta(minutes=30)
         data, meta = self._between(start, end, entity_type=entity_type, entity_id=entity_id)
         if data:
             gen_index = meta.index("generation_mw")
-            pv_energy = sum([x[gen_index] if x[gen_index] is not None else 0 for x in data]) * 0.5
-            return pv_energy
+            gens = np.fromiter((np.nan if x[gen_index] is None else x[gen_index] for x in data),
+                               dtype=np.float64, count=len(data))
+            return float(np.nansum(gens)) * 0.5
         return None
 
     def _between(self, start, end, entity_type="gsp", entity_id=0, extra_fields="", period=30,
@@ -425,118 +781,285 @@ class PVLive:
         Get the PV_Live generation result for a given time interval from the API, returning both the
         data and the columns.
         """
-        self._validate_inputs(entity_type=entity_type, entity_id=entity_id,
-                              extra_fields=extra_fields, period=period)
-        type_check = not (isinstance(start, datetime) and isinstance(end, datetime))
-        tz_check = start.tzinfo is None or end.tzinfo is None
-        if type_check or tz_check:
+        windows = self._entity_windows(start, end, entity_type, entity_id, extra_fields, period)
+        data, meta = self._query_windows(entity_type, extra_fields, period,
+                                         [(entity_id, window) for window in windows])
+        if dataframe:
+            return self._convert_tuple_to_df(data, meta), meta
+        return data, meta
+
+    def _entity_windows(self, start, end, entity_type, entity_id, extra_fields, period):
+        """
+        Validate the inputs to `between()` and split the interval into the windows to request.
+        """
+        if not (isinstance(start, datetime) and isinstance(end, datetime)) \
+                or start.tzinfo is None or end.tzinfo is None:
             raise ValueError("`start` and `end` must be timezone-aware Python datetime objects.")
         if end < start:
             raise ValueError("Start must be later than end.")
+        self._validate_inputs(entity_type=entity_type, entity_id=entity_id,
+                              extra_fields=extra_fields, period=period)
         start = self._nearest_interval(start, period=period)
         end = self._nearest_interval(end, period=period)
-        data = []
+        max_range = self.max_range["national"] if entity_id == 0 else self.max_range["regional"]
+        return self._windows(start, end, max_range, period)
+
+    def _query_windows(self, entity_type, extra_fields, period, tasks):
+        """
+        Query the API concurrently for each of `tasks`, a list of (entity_id, (start, end)), and
+        return the rows of all responses in order along with the columns.
+        """
+        cache_before = datetime.now(tz=timezone.utc) - self.cache_horizon
+
+        def query_window(task):
+            entity_id, (request_start, request_end) = task
+            return self._query_api(entity_type, entity_id, extra_fields, request_start,
+                                   request_end, period, cache=request_end < cache_before)
+
+        responses = self._map(query_window, tasks)
+        data = [row for response in responses for row in response["data"]]
+        return data, responses[0]["meta"]
+
+    @staticmethod
+    def _concat(results):
+        """Concatenate the DataFrames in `results` which contain data, or return None if none do."""
+        results = [r for r in results if r is not None and not r.empty]
+        if results:
+            return pd.concat(results, ignore_index=True)
+        return None
+
+    @staticmethod
+    def _windows(start, end, max_range, period=30):
+        """Split the interval from `start` to `end` into windows no longer than `max_range`."""
+        windows = []
         request_start = start
-        max_range = self.max_range["national"] if entity_id == 0 and entity_type == 0 else \
-            self.max_range["regional"]
         while request_start <= end:
             request_end = min(end, request_start + max_range)
-            params = self._compile_params(extra_fields, request_start, request_end, period)
-            response = self._query_api(entity_type, entity_id, params)
-            data += response["data"]
+            windows.append((request_start, request_end))
             request_start += max_range + timedelta(minutes=period)
-        if dataframe:
-            return self._convert_tuple_to_df(data, response["meta"]), response["meta"]
-        return data, response["meta"]
-
-    def _compile_params(self, extra_fields="", start=None, end=None, period=30):
-        """Compile parameters into a Python dict, formatting where necessary."""
-        params = {}
-        if extra_fields:
-            params["extra_fields"] = extra_fields
-        if start is not None:
-            params["start"] = start.isoformat().replace("+00:00", "Z")
-        end = start if (start is not None and end is None) else end
-        if end is not None:
-            params["end"] = end.isoformat().replace("+00:00", "Z")
-        params["period"] = period
-        return params
+        return windows
 
-    def _query_api(self, entity_type, entity_id, params):
+    def _map(self, func, items, max_workers=None):
+        """
+        Apply `func` to each of `items`, using a pool of threads when there is more than one item so
+        that requests to the API are made concurrently. Results are returned in order. When called
+        from within another `_map()` (e.g. `between()` via `map()`), `items` are processed serially
+        so that at most `max_workers` requests are in flight.
+        """
+        items = list(items)
+        max_workers = self.max_workers if max_workers is None else max_workers
+        if len(items) <= 1 or max_workers <= 1 or getattr(_POOL_WORKER, "active", False):
+            return [func(item) for item in items]
+
+        def run(item):
+            _POOL_WORKER.active = True
+            return func(item)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(run, items))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _format_datetime(dt):
+        """
+        Format a timezone-aware datetime as a UTC ISO 8601 string, e.g. '2024-01-01T00:30:00Z'.
+        """
+        return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _query_api(self, entity_type, entity_id, extra_fields="", start=None, end=None, period=30,
+                   cache=False):
         """Query the API with some REST parameters."""
-        url = self._build_url(entity_type, entity_id, params)
-        return self._fetch_url(url)
+        url = self._build_url(entity_type, entity_id, extra_fields, start, end, period)
+        return self._fetch_json(url, cache=cache)
 
     def _convert_tuple_to_df(self, data, columns):
         """Converts a tuple of values to a data-frame object."""
         data = [data] if isinstance(data, tuple) else data
-        data = [tuple(nan if d is None else d for d in t) for t in data]
-        data = pd.DataFrame(data, columns=columns)
+        arrays = [self._column_to_array(values) for values in zip(*data)]
+        data = pd.DataFrame(dict(zip(columns, arrays)) if arrays else None, columns=columns)
         if "datetime_gmt" in data.columns:
-            data.datetime_gmt = pd.to_datetime(data.datetime_gmt)
-        return data
+            data.datetime_gmt = pd.to_datetime(data.datetime_gmt, utc=True, format="ISO8601",
+                                               cache=True)
+        return self._downcast(data)
+
+    @staticmethod
+    def _column_to_array(values):
+        """Convert a column of values from the API to a typed numpy array, mapping None to NaN."""
+        if None in values:
+            try:
+                return np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                return np.array([np.nan if v is None else v for v in values], dtype=object)
+        if isinstance(values[0], str):
+            return np.array(values, dtype=object)  # Much cheaper than a fixed-width unicode array
+        return np.array(values)
 
-    def _build_url(self, entity_type, entity_id, params):
+    def _downcast(self, data):
+        """Convert the columns of a DataFrame to compact dtypes if `self.downcast` is True."""
+        if not self.downcast:
+            return data
+        return data.astype({c: DOWNCAST_DTYPES[c] for c in data.columns if c in DOWNCAST_DTYPES})
+
+    def _build_url(self, entity_type, entity_id, extra_fields="", start=None, end=None, period=30):
         """Construct the appropriate URL for a given set of parameters."""
-        base_url = f"{self.base_url}/{entity_type}/{entity_id}"
-        url = base_url + "?" + "&".join(["{}={}".format(k, params[k]) for k in params])
+        url = self._url_prefix(self.base_url, entity_type, entity_id, extra_fields, period)
+        if start is not None:
+            end = start if end is None else end
+            url += f"&start={self._format_datetime(start)}&end={self._format_datetime(end)}"
         return url
 
-    def _fetch_url(self, url, parse_json=True):
-        """Fetch the URL with GET request."""
-        success = False
-        try_counter = 0
-        delay = 1
-        while not success and try_counter < self.retries + 1:
-            try_counter += 1
-            try:
-                page = requests.get(url, proxies=self.proxies, verify=self.ssl_verify,
-                                    timeout=self.timeout)
-                page.raise_for_status()
-                success = True
-            except requests.exceptions.HTTPError as err:
-                if page.status_code == 400:
-                    helper = re.search(r"<p>(.*)</p>", page.text).group(1)
-                    raise PVLiveException(f"PV_Live API received Bad Request (400)... {helper}")
-                sleep(delay)
-                delay *= 2
-                continue
-        if not success:
-            raise PVLiveException("Error communicating with the PV_Live API.")
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _url_prefix(base_url, entity_type, entity_id, extra_fields, period):
+        """Construct the URL for an entity, excluding the start/end parameters which vary."""
+        params = {"extra_fields": extra_fields} if extra_fields else {}
+        params["period"] = period
+        return f"{base_url}/{entity_type}/{entity_id}?{urlencode(params)}"
+
+    def _fetch_json(self, url, cache=False):
+        """
+        Fetch the URL with GET request and decode the JSON response.
+
+        Set `cache` to True only for URLs whose content will not change (e.g. historical outturns),
+        in which case repeat requests for the same URL are served from memory.
+        """
+        return self._parse_json(self._fetch_content(url, cache=cache))
+
+    def _fetch_content(self, url, cache=False):
+        """
+        Fetch the body of the URL with GET request, using the in-memory cache of up to
+        `self.cache_size` responses if `cache` is True.
+        """
+        return self._get_cached(url) if cache else self._get(url).content
+
+    def _fetch_stream(self, url):
+        """
+        Fetch the URL with GET request, returning the response before its body has been downloaded
+        so that it can be read incrementally from `response.raw`. Use it as a context manager so
+        that the connection is released.
+        """
+        return self._get(url, stream=True)
+
+    def _get_content(self, url):
+        """Fetch the body of the URL with GET request."""
+        return self._get(url).content
+
+    @staticmethod
+    def _parse_json(content):
+        """Decode a JSON response from the API."""
         try:
-            if parse_json:
-                return json.loads(page.text)
-            else:
-                return page
-        except Exception as e:
+            return json_loads(content)
+        except ValueError as e:
             raise PVLiveException("Error communicating with the PV_Live API.") from e
 
-    def _nearest_interval(self, dt, period=30):
-        """Round to either the nearest 30 or 5 minute interval."""
-        if not(dt.minute % period == 0 and dt.second == 0 and dt.microsecond == 0):
-            dt = dt - timedelta(minutes=dt.minute % period, seconds=dt.second,
-                                microseconds=dt.microsecond) + timedelta(minutes=period)
-        return dt
+    def _fetch_persistent(self, url):
+        """
+        Fetch the content of a URL which changes infrequently (e.g. the GSP list).
+
+        Unless `self.use_cache` is False, the content is cached on disk in `self.cache_dir` for
+        `self.cache_ttl` so that it is shared between PVLive instances. Caching is best-effort and
+        any error reading or writing the cache falls back to fetching from the API.
+        """
+        if not self.use_cache:
+            return self._get(url).content
+        cache_file = self._cache_file(url)
+        try:
+            age = datetime.now().timestamp() - os.path.getmtime(cache_file)
+            if age < self.cache_ttl.total_seconds():
+                with open(cache_file, "rb") as fid:
+                    return fid.read()
+        except OSError:
+            pass
+        content = self._get(url).content
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_file, "wb") as fid:
+                fid.write(content)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            pass
+        return content
+
+    def _cache_file(self, url):
+        """Get the path of the on-disk cache file for a URL."""
+        return os.path.join(self.cache_dir, sha1(url.encode()).hexdigest())
+
+    def _get(self, url, stream=False):
+        """Send a GET request to the URL (retries are handled by the Session's adapter)."""
+        try:
+            page = self._session.get(url, proxies=self.proxies, verify=self.ssl_verify,
+                                     timeout=self.timeout, stream=stream)
+        except requests.exceptions.RequestException as e:
+            raise PVLiveException("Error communicating with the PV_Live API.") from e
+        if page.status_code == 400:
+            helper = BAD_REQUEST_REGEX.search(page.text).group(1)
+            raise PVLiveException(f"PV_Live API received Bad Request (400)... {helper}")
+        try:
+            page.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            page.close()
+            raise PVLiveException("Error communicating with the PV_Live API.") from e
+        return page
+
+    @staticmethod
+    def _nearest_interval(dt, period=30):
+        """Round up to either the nearest 30 or 5 minute interval."""
+        offset = ((dt.minute % period) * 60 + dt.second) * 1000000 + dt.microsecond
+        return dt + timedelta(microseconds=-offset % (period * 60000000))
+
+    @staticmethod
+    def _validate_entity_ids(entity_ids):
+        """Validate the `entity_ids` parameter of the bulk methods, returning it as a list."""
+        if isinstance(entity_ids, (str, bytes)) or not hasattr(entity_ids, "__iter__"):
+            raise TypeError("The entity_ids must be a list (or other iterable) of integers.")
+        entity_ids = list(entity_ids)
+        if not entity_ids:
+            raise ValueError("The entity_ids must contain at least one ID.")
+        return entity_ids
 
     def _validate_inputs(self, entity_type="gsp", entity_id=0, extra_fields="", period=30):
         """Validate common input parameters."""
         if not isinstance(entity_type, str):
             raise TypeError("The entity_type must be a string.")
-        if entity_type not in ["pes", "gsp"]:
+        if entity_type not in ("pes", "gsp"):
             raise ValueError("The entity_type must be either 'pes' or 'gsp'.")
         if not isinstance(extra_fields, str):
             raise TypeError("The extra_fields must be a comma-separated string (with no spaces).")
-        if entity_type == "pes":
-            if entity_id != 0 and entity_id not in self.pes_ids:
-                raise PVLiveException(f"The pes_id {entity_id} was not found.")
-        elif entity_type == "gsp":
-            if entity_id not in self.gsp_ids:
-                raise PVLiveException(f"The gsp_id {entity_id} was not found.")
-        periods = [5, 30]
+        if entity_id != 0:
+            with self._lists_lock:
+                entity_ids = self._pes_id_set if entity_type == "pes" else self._gsp_id_set
+            if entity_id not in entity_ids:
+                raise PVLiveException(f"The {entity_type}_id {entity_id} was not found.")
+        periods = (5, 30)
         if period not in periods:
             raise ValueError("The period parameter must be one of: "
                              f"{', '.join(map(str, periods))}.")
 
+def latest(*args, **kwargs):
+    """Call `PVLive.latest()` on the shared `PVLive.default()` instance."""
+    return PVLive.default().latest(*args, **kwargs)
+
+def at_time(*args, **kwargs):
+    """Call `PVLive.at_time()` on the shared `PVLive.default()` instance."""
+    return PVLive.default().at_time(*args, **kwargs)
+
+def between(*args, **kwargs):
+    """Call `PVLive.between()` on the shared `PVLive.default()` instance."""
+    return PVLive.default().between(*args, **kwargs)
+
+def day_peak(*args, **kwargs):
+    """Call `PVLive.day_peak()` on the shared `PVLive.default()` instance."""
+    return PVLive.default().day_peak(*args, **kwargs)
+
+def day_energy(*args, **kwargs):
+    """Call `PVLive.day_energy()` on the shared `PVLive.default()` instance."""
+    return PVLive.default().day_energy(*args, **kwargs)
+
+def deployment(*args, **kwargs):
+    """Call `PVLive.deployment()` on the shared `PVLive.default()` instance."""
+    return PVLive.default().deployment(*args, **kwargs)
+
 def parse_options():
     """Parse command line options."""
     parser = argparse.ArgumentParser(description=("This is a command line interface (CLI) for the "
@@ -591,15 +1114,15 @@ def parse_options():
                 sys.exit(0)
         if options.start is not None:
             try:
-                options.start = pytz.utc.localize(
-                    datetime.strptime(options.start, "%Y-%m-%d %H:%M:%S")
-                )
+                options.start = datetime.strptime(options.start, "%Y-%m-%d %H:%M:%S")\
+                    .replace(tzinfo=timezone.utc)
             except:
                 raise Exception("OptionsError: Failed to parse start datetime, make sure you use "
                                 "'yyyy-mm-dd HH:MM:SS' format.")
         if options.end is not None:
             try:
-                options.end = pytz.utc.localize(datetime.strptime(options.end, "%Y-%m-%d %H:%M:%S"))
+                options.end = datetime.strptime(options.end, "%Y-%m-%d %H:%M:%S")\
+                    .replace(tzinfo=timezone.utc)
             except:
                 raise Exception("OptionsError: Failed to parse end datetime, make sure you use "
                                 "'yyyy-mm-dd HH:MM:SS' format.")
@@ -615,17 +1138,17 @@ def parse_options():
 def main():
     """Load CLI options and access the API accordingly."""
     options = parse_options()
-    pvl = PVLive(proxies=options.proxies)
-    if options.start is None and options.end is None:
-        data = pvl.latest(entity_type=options.entity_type, entity_id=options.entity_id,
-                          extra_fields=options.extra_fields, dataframe=True)
-    else:
-        start = datetime(2014, 1, 1, 0, 30, tzinfo=pytz.utc) if options.start is None \
-            else options.start
-        end = pytz.utc.localize(datetime.utcnow()) if options.end is None else options.end
-        data = pvl.between(start, end, entity_type=options.entity_type, entity_id=options.entity_id,
-                           extra_fields=options.extra_fields, period=options.period,
-                           dataframe=True)
+    with PVLive(proxies=options.proxies) as pvl:
+        if options.start is None and options.end is None:
+            data = pvl.latest(entity_type=options.entity_type, entity_id=options.entity_id,
+                              extra_fields=options.extra_fields, dataframe=True)
+        else:
+            start = datetime(2014, 1, 1, 0, 30, tzinfo=timezone.utc) if options.start is None \
+                else options.start
+            end = datetime.now(tz=timezone.utc) if options.end is None else options.end
+            data = pvl.between(start, end, entity_type=options.entity_type,
+                               entity_id=options.entity_id, extra_fields=options.extra_fields,
+                               period=options.period, dataframe=True)
     if options.outfile is not None:
         data.to_csv(options.outfile, float_format="%.3f", index=False)
     if not options.quiet:
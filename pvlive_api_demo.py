@@ -8,8 +8,7 @@ See https://github.com/SheffieldSolar/PV_Live-API for installation instructions.
 - Updated: 2020-10-20 to return Pandas dataframe object
 """
 
-from datetime import datetime, date
-import pytz
+from datetime import datetime, date, timezone
 
 from pvlive_api import PVLive
 
@@ -17,114 +16,116 @@ def main():
     """
     Demo API's functionality.
     """
-    pvlive = PVLive()
-    print("---------- NATIONAL ----------")
-    print("\nLatest: ")
-    print(pvlive.latest())
-    print("\nAt 2019-03-18 12:00: ")
-    print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=pytz.utc)))
-    print("\nAt 2019-03-18 12:00 as a Pandas DataFrame object: ")
-    print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=pytz.utc), dataframe=True))
-    print("\nAt 2019-03-18 12:35 (with period=30): ")
-    print(pvlive.at_time(datetime(2019, 3, 18, 12, 35, tzinfo=pytz.utc)))
-    print("\nBetween 2019-03-18 10:30 and 2019-03-18 14:00: ")
-    print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=pytz.utc),
-                         datetime(2019, 3, 18, 14, 0, tzinfo=pytz.utc)))
-    print("\nBetween 2019-03-18 10:30 and 2019-03-18 14:00 as a Pandas DataFrame object: ")
-    print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=pytz.utc),
-                         datetime(2019, 3, 18, 14, 0, tzinfo=pytz.utc), dataframe=True))
-    print("\nPeak on 2019-03-18: ")
-    print(pvlive.day_peak(date(2019, 3, 18)))
-    print("\nPeak on 2019-03-18 as a Pandas DataFrame object: ")
-    print(pvlive.day_peak(date(2019, 3, 18), dataframe=True))
-    print("\nCumulative generation on 2019-03-18: ")
-    print(pvlive.day_energy(date(2019, 3, 18)))
+    with PVLive() as pvlive:
+        print("---------- NATIONAL ----------")
+        print("\nLatest: ")
+        print(pvlive.latest())
+        print("\nAt 2019-03-18 12:00: ")
+        print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=timezone.utc)))
+        print("\nAt 2019-03-18 12:00 as a Pandas DataFrame object: ")
+        print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=timezone.utc), dataframe=True))
+        print("\nAt 2019-03-18 12:35 (with period=30): ")
+        print(pvlive.at_time(datetime(2019, 3, 18, 12, 35, tzinfo=timezone.utc)))
+        print("\nBetween 2019-03-18 10:30 and 2019-03-18 14:00: ")
+        print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=timezone.utc),
+                             datetime(2019, 3, 18, 14, 0, tzinfo=timezone.utc)))
+        print("\nBetween 2019-03-18 10:30 and 2019-03-18 14:00 as a Pandas DataFrame object: ")
+        print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=timezone.utc),
+                             datetime(2019, 3, 18, 14, 0, tzinfo=timezone.utc), dataframe=True))
+        print("\nPeak on 2019-03-18: ")
+        print(pvlive.day_peak(date(2019, 3, 18)))
+        print("\nPeak on 2019-03-18 as a Pandas DataFrame object: ")
+        print(pvlive.day_peak(date(2019, 3, 18), dataframe=True))
+        print("\nCumulative generation on 2019-03-18: ")
+        print(pvlive.day_energy(date(2019, 3, 18)))
 
-    print("\n\n---------- NATIONAL 5 MIN----------")
-    print("\nLatest: ")
-    print(pvlive.latest(period=5))
-    print("\nAt 2024-05-01 12:05: ")
-    print(pvlive.at_time(datetime(2024, 5, 1, 12, 5, tzinfo=pytz.utc), period=5))
-    print("\nAt 2024-05-01 12:05 as a Pandas DataFrame object: ")
-    print(pvlive.at_time(datetime(2024, 5, 1, 12, 5, tzinfo=pytz.utc), period=5, dataframe=True))
-    print("\nBetween 2024-05-01 10:30 and 2024-05-01 14:00: ")
-    print(pvlive.between(datetime(2024, 5, 1, 10, 30, tzinfo=pytz.utc),
-                         datetime(2024, 5, 1, 14, 0, tzinfo=pytz.utc), period=5))
-    print("\nBetween 2024-05-01 10:30 and 2024-05-01 14:00 as a Pandas DataFrame object: ")
-    print(pvlive.between(datetime(2024, 5, 1, 10, 30, tzinfo=pytz.utc),
-                         datetime(2024, 5, 1, 14, 0, tzinfo=pytz.utc), period=5, dataframe=True))
-    print("\nPeak on 2024-05-01: ")
-    print(pvlive.day_peak(date(2024, 5, 1), period=5))
-    print("\nPeak on 2024-05-01 as a Pandas DataFrame object: ")
-    print(pvlive.day_peak(date(2024, 5, 1), period=5, dataframe=True))
+        print("\n\n---------- NATIONAL 5 MIN----------")
+        print("\nLatest: ")
+        print(pvlive.latest(period=5))
+        print("\nAt 2024-05-01 12:05: ")
+        print(pvlive.at_time(datetime(2024, 5, 1, 12, 5, tzinfo=timezone.utc), period=5))
+        print("\nAt 2024-05-01 12:05 as a Pandas DataFrame object: ")
+        print(pvlive.at_time(datetime(2024, 5, 1, 12, 5, tzinfo=timezone.utc), period=5,
+                             dataframe=True))
+        print("\nBetween 2024-05-01 10:30 and 2024-05-01 14:00: ")
+        print(pvlive.between(datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc),
+                             datetime(2024, 5, 1, 14, 0, tzinfo=timezone.utc), period=5))
+        print("\nBetween 2024-05-01 10:30 and 2024-05-01 14:00 as a Pandas DataFrame object: ")
+        print(pvlive.between(datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc),
+                             datetime(2024, 5, 1, 14, 0, tzinfo=timezone.utc), period=5,
+                             dataframe=True))
+        print("\nPeak on 2024-05-01: ")
+        print(pvlive.day_peak(date(2024, 5, 1), period=5))
+        print("\nPeak on 2024-05-01 as a Pandas DataFrame object: ")
+        print(pvlive.day_peak(date(2024, 5, 1), period=5, dataframe=True))
 
-    print("\n\n---------- REGIONAL - PES REGION 23 ----------")
-    print("\nLatest PES region 23: ")
-    print(pvlive.latest(entity_type="pes", entity_id=23))
-    print("\nLatest PES region 23 as a Pandas DataFrame object: ")
-    print(pvlive.latest(entity_type="pes", entity_id=23, dataframe=True))
-    print("\nPES region 23 at 2019-03-18 12:00: ")
-    print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=pytz.utc), entity_type="pes",
-                         entity_id=23))
-    print("\nPES region 23 at 2019-03-18 12:00 as a Pandas DataFrame object: ")
-    print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=pytz.utc), entity_type="pes",
-                         entity_id=23, dataframe=True))
-    print("\nPES region 23 between 2019-03-18 10:30 and 2019-03-18 14:00: ")
-    print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=pytz.utc),
-                         datetime(2019, 3, 18, 14, 0, tzinfo=pytz.utc), entity_type="pes",
-                         entity_id=23))
-    print("\nPES region 23 between 2019-03-18 10:30 and 2019-03-18 14:00 as a Pandas DataFrame "
-          "object: ")
-    print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=pytz.utc),
-                         datetime(2019, 3, 18, 14, 0, tzinfo=pytz.utc), entity_type="pes",
-                         entity_id=23, dataframe=True))
-    print("\nPES region 23 peak on 2019-03-18: ")
-    print(pvlive.day_peak(date(2019, 3, 18), entity_type="pes", entity_id=23))
-    print("\nPES region 23 peak on 2019-03-18 as a Pandas DataFrame object: ")
-    print(pvlive.day_peak(date(2019, 3, 18), entity_type="pes", entity_id=23, dataframe=True))
-    print("\nPES region 23 cumulative generation on 2019-03-18: ")
-    print(pvlive.day_energy(date(2019, 3, 18), entity_type="pes", entity_id=23))
+        print("\n\n---------- REGIONAL - PES REGION 23 ----------")
+        print("\nLatest PES region 23: ")
+        print(pvlive.latest(entity_type="pes", entity_id=23))
+        print("\nLatest PES region 23 as a Pandas DataFrame object: ")
+        print(pvlive.latest(entity_type="pes", entity_id=23, dataframe=True))
+        print("\nPES region 23 at 2019-03-18 12:00: ")
+        print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=timezone.utc), entity_type="pes",
+                             entity_id=23))
+        print("\nPES region 23 at 2019-03-18 12:00 as a Pandas DataFrame object: ")
+        print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=timezone.utc), entity_type="pes",
+                             entity_id=23, dataframe=True))
+        print("\nPES region 23 between 2019-03-18 10:30 and 2019-03-18 14:00: ")
+        print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=timezone.utc),
+                             datetime(2019, 3, 18, 14, 0, tzinfo=timezone.utc), entity_type="pes",
+                             entity_id=23))
+        print("\nPES region 23 between 2019-03-18 10:30 and 2019-03-18 14:00 as a Pandas DataFrame "
+              "object: ")
+        print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=timezone.utc),
+                             datetime(2019, 3, 18, 14, 0, tzinfo=timezone.utc), entity_type="pes",
+                             entity_id=23, dataframe=True))
+        print("\nPES region 23 peak on 2019-03-18: ")
+        print(pvlive.day_peak(date(2019, 3, 18), entity_type="pes", entity_id=23))
+        print("\nPES region 23 peak on 2019-03-18 as a Pandas DataFrame object: ")
+        print(pvlive.day_peak(date(2019, 3, 18), entity_type="pes", entity_id=23, dataframe=True))
+        print("\nPES region 23 cumulative generation on 2019-03-18: ")
+        print(pvlive.day_energy(date(2019, 3, 18), entity_type="pes", entity_id=23))
 
-    print("\n\n---------- REGIONAL - GSP ID 120 ----------")
-    print("\nLatest GSP ID 120: ")
-    print(pvlive.latest(entity_type="gsp", entity_id=120))
-    print("\nLatest GSP ID 120 as a Pandas DataFrame object: ")
-    print(pvlive.latest(entity_type="gsp", entity_id=120, dataframe=True))
-    print("\nGSP ID 120 at 2019-03-18 12:00: ")
-    print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=pytz.utc), entity_type="gsp",
-                         entity_id=120))
-    print("\nGSP ID 120 at 2019-03-18 12:00 as a Pandas DataFrame object: ")
-    print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=pytz.utc), entity_type="gsp",
-                         entity_id=120, dataframe=True))
-    print("\nGSP ID 120 between 2019-03-18 10:30 and 2019-03-18 14:00: ")
-    print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=pytz.utc),
-                         datetime(2019, 3, 18, 14, 0, tzinfo=pytz.utc), entity_type="gsp",
-                         entity_id=120))
-    print("\nGSP ID 120 between 2019-03-18 10:30 and 2019-03-18 14:00 as a Pandas DataFrame "
-          "object: ")
-    print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=pytz.utc),
-                         datetime(2019, 3, 18, 14, 0, tzinfo=pytz.utc), entity_type="gsp",
-                         entity_id=120, dataframe=True))
-    print("\nGSP ID 120 peak on 2019-03-18: ")
-    print(pvlive.day_peak(date(2019, 3, 18), entity_type="gsp", entity_id=120))
-    print("\nGSP ID 120 peak on 2019-03-18 as a Pandas DataFrame object: ")
-    print(pvlive.day_peak(date(2019, 3, 18), entity_type="gsp", entity_id=120, dataframe=True))
-    print("\nGSP ID 120 cumulative generation on 2019-03-18: ")
-    print(pvlive.day_energy(date(2019, 3, 18), entity_type="gsp", entity_id=120))
+        print("\n\n---------- REGIONAL - GSP ID 120 ----------")
+        print("\nLatest GSP ID 120: ")
+        print(pvlive.latest(entity_type="gsp", entity_id=120))
+        print("\nLatest GSP ID 120 as a Pandas DataFrame object: ")
+        print(pvlive.latest(entity_type="gsp", entity_id=120, dataframe=True))
+        print("\nGSP ID 120 at 2019-03-18 12:00: ")
+        print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=timezone.utc), entity_type="gsp",
+                             entity_id=120))
+        print("\nGSP ID 120 at 2019-03-18 12:00 as a Pandas DataFrame object: ")
+        print(pvlive.at_time(datetime(2019, 3, 18, 12, 0, tzinfo=timezone.utc), entity_type="gsp",
+                             entity_id=120, dataframe=True))
+        print("\nGSP ID 120 between 2019-03-18 10:30 and 2019-03-18 14:00: ")
+        print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=timezone.utc),
+                             datetime(2019, 3, 18, 14, 0, tzinfo=timezone.utc), entity_type="gsp",
+                             entity_id=120))
+        print("\nGSP ID 120 between 2019-03-18 10:30 and 2019-03-18 14:00 as a Pandas DataFrame "
+              "object: ")
+        print(pvlive.between(datetime(2019, 3, 18, 10, 30, tzinfo=timezone.utc),
+                             datetime(2019, 3, 18, 14, 0, tzinfo=timezone.utc), entity_type="gsp",
+                             entity_id=120, dataframe=True))
+        print("\nGSP ID 120 peak on 2019-03-18: ")
+        print(pvlive.day_peak(date(2019, 3, 18), entity_type="gsp", entity_id=120))
+        print("\nGSP ID 120 peak on 2019-03-18 as a Pandas DataFrame object: ")
+        print(pvlive.day_peak(date(2019, 3, 18), entity_type="gsp", entity_id=120, dataframe=True))
+        print("\nGSP ID 120 cumulative generation on 2019-03-18: ")
+        print(pvlive.day_energy(date(2019, 3, 18), entity_type="gsp", entity_id=120))
 
-    print("\n\n---------- PV deployment ----------")
-    print("\nLatest by GSP: ")
-    print(pvlive.deployment(region="gsp"))
-    print("\nLatest by LLSOA: ")
-    print(pvlive.deployment(region="llsoa"))
-    print("\nHistorical by GSP: ")
-    print(pvlive.deployment(region="gsp", include_history=True))
-    print("\nHistorical by GSP and system size: ")
-    print(pvlive.deployment(region="gsp", include_history=True, by_system_size=True))
-    print("\nLatest by GSP, using previous release: ")
-    print(pvlive.deployment(region="gsp", release=1))
-    print("\nLatest by GSP, using specific release (20230404): ")
-    print(pvlive.deployment(region="gsp", release="20230404"))
+        print("\n\n---------- PV deployment ----------")
+        print("\nLatest by GSP: ")
+        print(pvlive.deployment(region="gsp"))
+        print("\nLatest by LLSOA: ")
+        print(pvlive.deployment(region="llsoa"))
+        print("\nHistorical by GSP: ")
+        print(pvlive.deployment(region="gsp", include_history=True))
+        print("\nHistorical by GSP and system size: ")
+        print(pvlive.deployment(region="gsp", include_history=True, by_system_size=True))
+        print("\nLatest by GSP, using previous release: ")
+        print(pvlive.deployment(region="gsp", release=1))
+        print("\nLatest by GSP, using specific release (20230404): ")
+        print(pvlive.deployment(region="gsp", release="20230404"))
 
 if __name__ == "__main__":
     main()